@@ -0,0 +1,27 @@
+"""BMEcat -> Shopware 6 import pipeline."""
+
+from .bmecat import extract_input, iter_bmecat_products, open_bmecat
+from .client import ShopwareClient, SyncError
+from .importer import import_products, import_products_stream
+from .models import Price, Product
+from .ndjson import append_ndjson, iter_ndjson, tee_ndjson, write_ndjson
+from .settings import Settings
+
+__all__ = [
+    "Price",
+    "Product",
+    "Settings",
+    "ShopwareClient",
+    "SyncError",
+    "append_ndjson",
+    "extract_input",
+    "import_products",
+    "import_products_stream",
+    "iter_bmecat_products",
+    "iter_ndjson",
+    "open_bmecat",
+    "tee_ndjson",
+    "write_ndjson",
+]
+
+__version__ = "0.1.0"
@@ -0,0 +1,286 @@
+"""Streaming BMEcat catalog parser.
+
+Reads BMEcat 1.2 / 2005 files of arbitrary size with ``lxml.etree.iterparse``
+and yields one :class:`~shopware_bmecat.models.Product` per ``ARTICLE``/
+``PRODUCT``. Catalogs in the wild
+use inconsistent namespaces, so each article subtree has its namespaces
+stripped once before parsing and all selectors match plain local names.
+Selectors are compiled once at import time so the per-article work does
+not re-tokenize path expressions.
+"""
+
+from __future__ import annotations
+
+import logging
+import mmap
+import shutil
+import zipfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Any, Iterator
+
+from lxml import etree
+
+from .models import Price, Product
+
+log = logging.getLogger(__name__)
+
+#: Defaults for the ``mapping`` section of the config; any key can be
+#: overridden to point at a different BMEcat tag.
+DEFAULT_MAPPING = {
+    "product_number": "SUPPLIER_AID",
+    "name": "DESCRIPTION_SHORT",
+    "description": "DESCRIPTION_LONG",
+    "ean": "EAN",
+    "manufacturer": "MANUFACTURER_NAME",
+    "price_type": "net_customer",
+}
+
+# Precompiled selectors. XPath objects are compiled once and called like
+# functions, so the per-article work skips lxml's path tokenizer entirely.
+# Namespaces are stripped from each ARTICLE in one walk before parsing
+# (see _strip_namespaces), so the selectors match plain local names and
+# lxml's C core never runs per-node namespace comparisons.
+_FEATURE_XP = etree.XPath("(.//ARTICLE_FEATURES | .//PRODUCT_FEATURES)/FEATURE")
+
+#: FEATURE child tags, mapped onto the slot they fill. The 1.2 names
+#: (FNAME/FVALUE/FUNIT) win over the 2005 ones when both are present.
+_FEATURE_SLOTS = {
+    "FNAME": "name",
+    "NAME": "name",
+    "FVALUE": "value",
+    "VALUE": "value",
+    "FUNIT": "unit",
+    "UNIT": "unit",
+}
+
+#: Parsed-row fields that map 1:1 onto a configured BMEcat tag.
+_TEXT_FIELDS = ("product_number", "name", "description", "ean", "manufacturer")
+
+
+def _strip_namespaces(elem: etree._Element) -> None:
+    """Rewrite every tag in the subtree to its local name, in one walk."""
+    for node in elem.iter():
+        tag = node.tag
+        if isinstance(tag, str) and "}" in tag:
+            node.tag = tag.rsplit("}", 1)[-1]
+    etree.cleanup_namespaces(elem)
+
+
+def _parse_features(elem: etree._Element) -> dict[str, str]:
+    """Flatten FEATURE elements into a ``{name: "value [unit]"}`` dict.
+
+    One compiled union XPath collects the FEATURE elements of both feature
+    containers, and each feature's children are walked exactly once instead
+    of being probed per candidate tag.
+    """
+    features: dict[str, str] = {}
+    for feature in _FEATURE_XP(elem):
+        slots: dict[str, str] = {}
+        primary: set[str] = set()
+        for child in feature:
+            slot = _FEATURE_SLOTS.get(child.tag)
+            if slot is None or not child.text or not child.text.strip():
+                continue
+            if child.tag[0] == "F":
+                if slot not in primary:
+                    slots[slot] = child.text.strip()
+                    primary.add(slot)
+            elif slot not in slots:
+                slots[slot] = child.text.strip()
+        name = slots.get("name")
+        value = slots.get("value")
+        if not name or not value:
+            continue
+        unit = slots.get("unit")
+        features[name] = f"{value} {unit}" if unit else value
+    return features
+
+
+def _select_price(prices: list[dict[str, Any]], price_type: str) -> Price | None:
+    """Pick the collected price matching *price_type*, else the first one."""
+    chosen = None
+    for price in prices:
+        if price.get("price_type") == price_type and chosen is None:
+            chosen = price
+    if chosen is None and prices:
+        chosen = prices[0]
+    if chosen is None or chosen["net"] is None:
+        return None
+    return Price(net=chosen["net"], currency=chosen["currency"], tax=chosen["tax"])
+
+
+def _parse_article(
+    elem: etree._Element,
+    field_by_tag: dict[str, str],
+    price_type: str,
+) -> Product | None:
+    """Turn one ARTICLE element into a Product, or None if unusable.
+
+    Everything except features comes out of a single ``elem.iter()`` walk:
+    mapped text fields, price blocks and media sources are dispatched on
+    the (namespace-stripped) tag, so the subtree is traversed once instead
+    of once per field.
+    """
+    values: dict[str, str] = {}
+    prices: list[dict[str, Any]] = []
+    media: list[str] = []
+    current_price: dict[str, Any] | None = None
+    for node in elem.iter():
+        tag = node.tag
+        if not isinstance(tag, str):  # comments / processing instructions
+            continue
+        field = field_by_tag.get(tag)
+        if field is not None:
+            text = node.text
+            if field not in values and text and text.strip():
+                values[field] = text.strip()
+            continue
+        if tag == "ARTICLE_PRICE" or tag == "PRODUCT_PRICE":
+            current_price = {
+                "price_type": node.get("price_type"),
+                "net": None,
+                "currency": None,
+                "tax": None,
+            }
+            prices.append(current_price)
+        elif tag == "PRICE_AMOUNT":
+            if current_price is not None and current_price["net"] is None and node.text:
+                current_price["net"] = node.text.strip()
+        elif tag == "PRICE_CURRENCY":
+            if current_price is not None and current_price["currency"] is None and node.text:
+                current_price["currency"] = node.text.strip()
+        elif tag == "TAX":
+            if current_price is not None and current_price["tax"] is None and node.text:
+                current_price["tax"] = node.text.strip()
+        elif tag == "MIME_SOURCE":
+            parent = node.getparent()
+            if (node.text and parent is not None and parent.tag == "MIME"
+                    and parent.getparent() is not None
+                    and parent.getparent().tag == "MIME_INFO"):
+                media.append(node.text.strip())
+    product_number = values.get("product_number")
+    if not product_number:
+        return None
+    price = _select_price(prices, price_type)
+    return Product(
+        productNumber=product_number,
+        name=values.get("name"),
+        description=values.get("description"),
+        ean=values.get("ean"),
+        manufacturer=values.get("manufacturer"),
+        price=price,
+        tax_rate=price.tax if price else None,
+        customFields=_parse_features(elem),
+        media=media,
+    )
+
+
+def _cleanup_element(elem: etree._Element) -> None:
+    """Free the processed subtree and fully-built preceding siblings.
+
+    Without this, iterparse keeps the whole document tree in memory.
+    """
+    elem.clear()
+    parent = elem.getparent()
+    if parent is None:
+        return
+    while elem.getprevious() is not None:
+        del parent[0]
+
+
+@contextmanager
+def open_bmecat(input_path: Path | str) -> Iterator[IO[bytes]]:
+    """Open the catalog XML behind *input_path* as a binary stream.
+
+    ZIP archives are read through ``ZipFile.open`` (first ``.xml`` member),
+    so the member is decompressed on the fly instead of being extracted to
+    disk first; plain files are simply opened.
+    """
+    input_path = Path(input_path)
+    if input_path.suffix.lower() != ".zip":
+        with open(input_path, "rb") as handle:
+            yield handle
+        return
+    with zipfile.ZipFile(input_path) as archive:
+        for name in archive.namelist():
+            if name.lower().endswith(".xml"):
+                with archive.open(name) as stream:
+                    yield stream
+                return
+        raise FileNotFoundError(f"no .xml member found in {input_path}")
+
+
+def iter_bmecat_products(
+    source: Path | str | IO[bytes],
+    mapping: dict[str, str] | None = None,
+) -> Iterator[Product]:
+    """Stream Product rows out of a BMEcat file or open binary stream.
+
+    Memory use stays flat regardless of catalog size; articles that lack a
+    product number are skipped with a debug log line.
+    """
+    merged = dict(DEFAULT_MAPPING)
+    if mapping:
+        merged.update(mapping)
+    field_by_tag = {merged[field]: field for field in _TEXT_FIELDS}
+    price_type = merged["price_type"]
+    skipped = 0
+    if hasattr(source, "read"):
+        handle = None
+        stream: Any = source
+    else:
+        # Map the catalog into memory so the kernel pages it in on demand
+        # instead of copying every block through a read() buffer.
+        handle = open(source, "rb")
+        try:
+            stream = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):  # empty or unmappable file
+            stream = handle
+    try:
+        # The tag filter keeps the event loop inside lxml's C layer: Python
+        # only sees ARTICLE/PRODUCT ends instead of one callback per element.
+        context = etree.iterparse(
+            stream,
+            events=("end",),
+            tag=("{*}ARTICLE", "{*}PRODUCT"),
+            recover=True,
+            huge_tree=True,
+        )
+        for _event, elem in context:
+            _strip_namespaces(elem)
+            product = _parse_article(elem, field_by_tag, price_type)
+            if product is not None:
+                yield product
+            else:
+                skipped += 1
+            _cleanup_element(elem)
+        del context
+    finally:
+        if handle is not None:
+            if stream is not handle:
+                stream.close()
+            handle.close()
+    if skipped:
+        log.debug("skipped %d articles without a product number", skipped)
+
+
+def extract_input(input_path: Path | str, work_dir: Path | str) -> Path:
+    """Materialize the catalog XML from *input_path* into *work_dir*.
+
+    ZIP archives are unpacked (first ``.xml`` member); plain XML files are
+    returned as-is.
+    """
+    input_path = Path(input_path)
+    if input_path.suffix.lower() != ".zip":
+        return input_path
+    work_dir = Path(work_dir)
+    work_dir.mkdir(parents=True, exist_ok=True)
+    with zipfile.ZipFile(input_path) as archive:
+        for name in archive.namelist():
+            if name.lower().endswith(".xml"):
+                target = work_dir / Path(name).name
+                with archive.open(name) as src, open(target, "wb") as dst:
+                    shutil.copyfileobj(src, dst)
+                return target
+    raise FileNotFoundError(f"no .xml member found in {input_path}")
@@ -0,0 +1,116 @@
+"""Command line entry points: extract, parse, import, run-all."""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+from .bmecat import extract_input, iter_bmecat_products, open_bmecat
+from .importer import import_products, import_products_stream
+from .logutil import configure_logging
+from .ndjson import tee_ndjson, write_ndjson
+from .settings import Settings
+
+
+def extract_cmd(args: argparse.Namespace) -> int:
+    xml_path = extract_input(args.input, args.work_dir)
+    print(xml_path)
+    return 0
+
+
+def parse_cmd(args: argparse.Namespace) -> int:
+    settings = Settings.load(args.config)
+    count = write_ndjson(
+        iter_bmecat_products(args.input, settings.mapping), args.output
+    )
+    print(f"wrote {count} products to {args.output}")
+    return 0
+
+
+def import_cmd(args: argparse.Namespace) -> int:
+    settings = Settings.load(args.config)
+    stats = import_products(
+        args.input,
+        settings,
+        batch_size=args.batch_size,
+        error_path=args.errors,
+        media_queue_path=args.media_queue,
+        concurrency=args.concurrency,
+    )
+    return 0 if stats["imported"] else 1
+
+
+def run_all_cmd(args: argparse.Namespace) -> int:
+    """Extract, parse and import in one streaming pass — the whole pipeline.
+
+    Parsed products flow straight into the importer; the intermediate
+    products.ndjson file is only written when --persist is given.
+    """
+    settings = Settings.load(args.config)
+    work_dir = Path(args.work_dir)
+    work_dir.mkdir(parents=True, exist_ok=True)
+    with open_bmecat(args.input) as stream:
+        products = iter_bmecat_products(stream, settings.mapping)
+        if args.persist:
+            products = tee_ndjson(products, work_dir / "products.ndjson")
+        stats = import_products_stream(
+            products,
+            settings,
+            batch_size=args.batch_size,
+            concurrency=args.concurrency,
+            error_path=work_dir / "errors.ndjson",
+            media_queue_path=work_dir / "media_queue.ndjson",
+        )
+    print(f"imported {stats['imported']}/{stats['total']} products")
+    return 0 if stats["imported"] else 1
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="shopware-bmecat")
+    parser.add_argument("-v", "--verbose", action="store_true")
+    parser.add_argument("--log-json", action="store_true",
+                        help="emit logs as NDJSON")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    extract = sub.add_parser("extract", help="unpack a catalog archive")
+    extract.add_argument("input", type=Path)
+    extract.add_argument("--work-dir", type=Path, default=Path("work"))
+    extract.set_defaults(func=extract_cmd)
+
+    parse = sub.add_parser("parse", help="BMEcat XML -> NDJSON")
+    parse.add_argument("input", type=Path)
+    parse.add_argument("output", type=Path)
+    parse.add_argument("--config", type=Path, default=Path("config.yaml"))
+    parse.set_defaults(func=parse_cmd)
+
+    import_ = sub.add_parser("import", help="NDJSON -> Shopware")
+    import_.add_argument("input", type=Path)
+    import_.add_argument("--config", type=Path, default=Path("config.yaml"))
+    import_.add_argument("--batch-size", type=int, default=None)
+    import_.add_argument("--concurrency", type=int, default=None)
+    import_.add_argument("--errors", type=Path, default=None)
+    import_.add_argument("--media-queue", type=Path, default=None)
+    import_.set_defaults(func=import_cmd)
+
+    run_all = sub.add_parser("run-all", help="extract + parse + import")
+    run_all.add_argument("input", type=Path)
+    run_all.add_argument("--config", type=Path, default=Path("config.yaml"))
+    run_all.add_argument("--work-dir", type=Path, default=Path("work"))
+    run_all.add_argument("--batch-size", type=int, default=None)
+    run_all.add_argument("--concurrency", type=int, default=None)
+    run_all.add_argument("--persist", action="store_true",
+                         help="also write the parsed products.ndjson")
+    run_all.set_defaults(func=run_all_cmd)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    configure_logging(verbose=args.verbose, as_json=args.log_json)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
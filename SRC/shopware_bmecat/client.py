@@ -0,0 +1,115 @@
+"""Thin Shopware 6 admin-API client around httpx."""
+
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any
+
+import httpx
+
+try:
+    import h2  # noqa: F401  (the 'http2' extra; httpx needs it for HTTP/2)
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
+
+log = logging.getLogger(__name__)
+
+
+class SyncError(RuntimeError):
+    """Raised when a sync operation is rejected by Shopware."""
+
+    def __init__(self, message: str, status_code: int | None = None,
+                 errors: list[dict[str, Any]] | None = None) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+        self.errors = errors or []
+
+
+class ShopwareClient:
+    """Authenticated client for ``/api/_action/sync`` upserts.
+
+    Uses the integration (client-credentials) OAuth flow and refreshes the
+    token shortly before it expires.
+    """
+
+    def __init__(self, base_url: str, client_id: str, client_secret: str,
+                 timeout: float = 60.0) -> None:
+        self._client_id = client_id
+        self._client_secret = client_secret
+        # Generous keep-alive so every batch (and the token refreshes) rides
+        # the same TLS session instead of paying new handshakes; HTTP/2 lets
+        # concurrent batches multiplex over one connection when h2 is there.
+        self._http = httpx.Client(
+            base_url=base_url.rstrip("/"),
+            http2=_HTTP2,
+            limits=httpx.Limits(
+                max_connections=16,
+                max_keepalive_connections=16,
+                keepalive_expiry=300.0,
+            ),
+            timeout=httpx.Timeout(timeout, connect=10.0),
+        )
+        self._token: str | None = None
+        self._token_expires_at = 0.0
+
+    def __enter__(self) -> "ShopwareClient":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._http.close()
+
+    def _ensure_token(self) -> str:
+        if self._token is None or time.monotonic() >= self._token_expires_at:
+            response = self._http.post(
+                "/api/oauth/token",
+                json={
+                    "grant_type": "client_credentials",
+                    "client_id": self._client_id,
+                    "client_secret": self._client_secret,
+                },
+            )
+            response.raise_for_status()
+            data = response.json()
+            self._token = data["access_token"]
+            # Refresh one minute early so in-flight requests never race expiry.
+            self._token_expires_at = time.monotonic() + data.get("expires_in", 600) - 60
+        return self._token
+
+    def sync_upsert(self, entity: str, payload: list[dict[str, Any]]) -> dict[str, Any]:
+        """Upsert *payload* rows for *entity* in a single sync operation."""
+        if not payload:
+            return {}
+        response = self._http.post(
+            "/api/_action/sync",
+            headers={
+                "Authorization": f"Bearer {self._ensure_token()}",
+                "single-operation": "true",
+                "fail-on-error": "true",
+            },
+            json={
+                f"upsert-{entity}": {
+                    "entity": entity,
+                    "action": "upsert",
+                    "payload": payload,
+                }
+            },
+        )
+        if response.is_success:
+            return response.json()
+        try:
+            body = response.json()
+            errors = body.get("errors", [])
+        except ValueError:
+            errors = []
+        log.warning("sync upsert of %d %s rows failed: HTTP %d",
+                    len(payload), entity, response.status_code)
+        raise SyncError(
+            f"sync upsert of {entity} failed with HTTP {response.status_code}",
+            status_code=response.status_code,
+            errors=errors,
+        )
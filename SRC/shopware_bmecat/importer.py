@@ -0,0 +1,328 @@
+"""Import parsed products into Shopware via the sync API."""
+
+from __future__ import annotations
+
+import logging
+import re
+import uuid
+from hashlib import sha1
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Iterable
+
+try:
+    import numpy as np
+except ImportError:  # numpy is an optional extra; the scalar path works without it
+    np = None
+
+from .client import ShopwareClient, SyncError
+from .models import Product
+from .ndjson import append_ndjson, iter_ndjson
+from .settings import Settings
+
+log = logging.getLogger(__name__)
+
+#: Below this batch size the numpy round trip costs more than it saves.
+_VECTOR_MIN = 250
+
+
+_NAMESPACE_BYTES = uuid.NAMESPACE_URL.bytes
+
+
+@lru_cache(maxsize=None)
+def _stable_uuid(prefix: str, value: str) -> str:
+    """Deterministic Shopware id so re-runs upsert instead of duplicating.
+
+    Equivalent to ``uuid.uuid5(NAMESPACE_URL, f"{prefix}:{value}").hex``
+    but hashes directly, skipping the UUID object construction and
+    dash-formatting that uuid5 does per call. Cached because the same
+    (prefix, value) pair recurs constantly — every product repeats its
+    manufacturer name, and the manufacturer upsert hashes the same set
+    again.
+    """
+    digest = sha1(_NAMESPACE_BYTES + f"{prefix}:{value}".encode(),
+                  usedforsecurity=False).digest()
+    raw = bytearray(digest[:16])
+    raw[6] = (raw[6] & 0x0F) | 0x50  # version 5
+    raw[8] = (raw[8] & 0x3F) | 0x80  # RFC 4122 variant
+    return raw.hex()
+
+
+def _coerce_float(value: Any) -> float | None:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = value.replace(",", ".")
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def calculate_gross(net: float, tax_rate: float) -> float:
+    """Gross price from net; accepts the rate as percent (19) or factor (0.19)."""
+    rate = tax_rate / 100.0 if tax_rate > 1.0 else tax_rate
+    return round(net * (1.0 + rate), 2)
+
+
+def _upsert_manufacturers(client: ShopwareClient, names: Iterable[str],
+                          batch_size: int = 200) -> None:
+    # Shopware doesn't care about payload order, and the ids are already
+    # cached from the product pass, so no sorting or re-hashing here.
+    payload = [
+        {"id": _stable_uuid("manufacturer", name), "name": name}
+        for name in names
+    ]
+    for start in range(0, len(payload), batch_size):
+        client.sync_upsert("product_manufacturer", payload[start:start + batch_size])
+    if payload:
+        log.info("upserted %d manufacturers", len(payload))
+
+
+def _resolve_tax_id(tax_rate: float | None, settings: Settings) -> str | None:
+    if tax_rate is not None:
+        rate = tax_rate * 100.0 if tax_rate <= 1.0 else tax_rate
+        for key in (str(rate), str(int(rate))):
+            if key in settings.tax_mapping:
+                return settings.tax_mapping[key]
+    return settings.default_tax_id
+
+
+@lru_cache(maxsize=8)
+def _shared_payload_parts(
+    currency_id: str, sales_channel_id: str | None, visibility: int,
+) -> tuple[dict[str, Any], dict[str, Any]]:
+    """Payload fragments that are identical for every product in a run.
+
+    Allocated once and shared by reference across payloads — safe because
+    the client only serializes them and nothing downstream mutates.
+    """
+    price_const = {"currencyId": currency_id, "linked": True}
+    visibility_const = {"salesChannelId": sales_channel_id, "visibility": visibility}
+    return price_const, visibility_const
+
+
+def _build_product_payload(row: Product, settings: Settings) -> dict[str, Any] | None:
+    """Map a parsed product row onto the Shopware product entity."""
+    product_number = row.productNumber
+    if not product_number:
+        return None
+    net = _coerce_float(row.price.net) if row.price is not None else None
+    tax_rate = _coerce_float(row.tax_rate)
+    tax_id = _resolve_tax_id(tax_rate, settings)
+    if net is None or tax_id is None:
+        return None
+    price_const, visibility_const = _shared_payload_parts(
+        settings.currency_id, settings.sales_channel_id, settings.visibility
+    )
+    # gross starts as net and is filled in by _finalize_gross once the
+    # batch is assembled, so large batches can be computed in one pass.
+    price_row: dict[str, Any] = {"net": net, "gross": net}
+    price_row.update(price_const)
+    payload: dict[str, Any] = {
+        "id": _stable_uuid("product", product_number),
+        "productNumber": product_number,
+        "name": row.name or product_number,
+        "description": row.description,
+        "ean": row.ean,
+        "stock": 0,
+        "taxId": tax_id,
+        "price": [price_row],
+        # Consumed (and removed) by _finalize_gross; never sent to Shopware.
+        "_taxRate": tax_rate or 0.0,
+    }
+    if row.manufacturer:
+        payload["manufacturerId"] = _stable_uuid("manufacturer", row.manufacturer)
+    if row.customFields:
+        payload["customFields"] = row.customFields
+    if settings.sales_channel_id:
+        # The visibility id stays per-product so re-runs upsert instead of
+        # inserting duplicates; only the constant tail is shared.
+        payload["visibilities"] = [
+            {"id": _stable_uuid("visibility", product_number), **visibility_const}
+        ]
+    return payload
+
+
+def _finalize_gross(batch: list[dict[str, Any]]) -> None:
+    """Fill in the gross prices for a fully assembled batch.
+
+    Large batches go through one vectorized numpy pass instead of a Python
+    loop of float math per product; small batches (or installs without
+    numpy) fall back to calculate_gross per row.
+    """
+    rates = [payload.pop("_taxRate") for payload in batch]
+    if np is not None and len(batch) >= _VECTOR_MIN:
+        nets = np.fromiter(
+            (payload["price"][0]["net"] for payload in batch),
+            dtype=np.float64, count=len(batch),
+        )
+        factors = np.asarray(rates, dtype=np.float64)
+        gross = np.round(nets * (1.0 + np.where(factors > 1.0, factors / 100.0, factors)), 2)
+        for payload, value in zip(batch, gross.tolist()):
+            payload["price"][0]["gross"] = value
+    else:
+        for payload, rate in zip(batch, rates):
+            payload["price"][0]["gross"] = calculate_gross(payload["price"][0]["net"], rate)
+
+
+# Shopware error pointers look like "/upsert-product/3/taxId" (operation
+# key, then the payload index); older versions omit the operation key.
+_ERROR_POINTER = re.compile(r"^/(?:[^/\d][^/]*/)?(\d+)(?:/|$)")
+
+
+def _failed_indices(exc: SyncError, batch_len: int) -> set[int] | None:
+    """Payload indices named in the sync error response, or None if any
+    error cannot be attributed to a row."""
+    indices: set[int] = set()
+    for error in exc.errors:
+        pointer = (error.get("source") or {}).get("pointer") or ""
+        match = _ERROR_POINTER.match(pointer)
+        if not match:
+            return None
+        index = int(match.group(1))
+        if not 0 <= index < batch_len:
+            return None
+        indices.add(index)
+    return indices or None
+
+
+def _send_batch(client: ShopwareClient,
+                batch: list[dict[str, Any]]) -> tuple[int, list[dict[str, Any]]]:
+    """Send one batch, isolating rejected rows on failure.
+
+    Shopware's error response names the offending payload indices, so the
+    usual failure path drops exactly those rows and re-sends the rest once.
+    Bisecting is kept as a fallback for responses without usable pointers
+    (e.g. transport-level failures). Returns the number of accepted rows
+    and the rejected payloads; writing rejects to the error file is left to
+    the caller so batches can be sent from worker threads without
+    interleaving the error NDJSON.
+    """
+    if not batch:
+        return 0, []
+    try:
+        client.sync_upsert("product", batch)
+        return len(batch), []
+    except SyncError as exc:
+        if len(batch) == 1:
+            log.warning("product %s rejected: %s", batch[0].get("productNumber"), exc)
+            return 0, list(batch)
+        indices = _failed_indices(exc, len(batch))
+        if indices is not None:
+            bad = [batch[index] for index in sorted(indices)]
+            good = [row for index, row in enumerate(batch) if index not in indices]
+            for row in bad:
+                log.warning("product %s rejected: %s", row.get("productNumber"), exc)
+            sent, rejected = _send_batch(client, good)
+            return sent, rejected + bad
+        middle = len(batch) // 2
+        sent_a, rejected_a = _send_batch(client, batch[:middle])
+        sent_b, rejected_b = _send_batch(client, batch[middle:])
+        return sent_a + sent_b, rejected_a + rejected_b
+
+
+def import_products_stream(
+    products: Iterable[Product],
+    settings: Settings,
+    batch_size: int | None = None,
+    error_path: Path | str | None = None,
+    media_queue_path: Path | str | None = None,
+    concurrency: int | None = None,
+) -> dict[str, int]:
+    """Import product rows from any iterable; returns counters for the CLI.
+
+    Taking an iterator lets the parser feed the importer directly without
+    round-tripping every product through an intermediate NDJSON file.
+    Up to *concurrency* batches are in flight at once; the sync endpoint is
+    network-bound, so pipelining batches overlaps the server round trips.
+    """
+    batch_size = batch_size or settings.batch_size
+    concurrency = concurrency or settings.concurrency
+    sent = 0
+    skipped = 0
+    total = 0
+
+    with ShopwareClient(settings.shopware_url, settings.client_id,
+                        settings.client_secret) as client, \
+            ThreadPoolExecutor(max_workers=concurrency) as executor:
+        in_flight: deque[Future[tuple[int, list[dict[str, Any]]]]] = deque()
+
+        def _drain_one() -> None:
+            nonlocal sent
+            batch_sent, rejected = in_flight.popleft().result()
+            sent += batch_sent
+            if rejected and error_path is not None:
+                append_ndjson(rejected, error_path)
+
+        batch: list[dict[str, Any]] = []
+        media_queue: list[dict[str, Any]] = []
+        # Manufacturers are upserted lazily in one pass with the products:
+        # new names collect here and are flushed before any product batch
+        # that references them goes out.
+        seen_manufacturers: set[str] = set()
+        pending_manufacturers: set[str] = set()
+        for row in products:
+            total += 1
+            payload = _build_product_payload(row, settings)
+            if payload is None:
+                skipped += 1
+                if error_path is not None:
+                    append_ndjson([row], error_path)
+                continue
+            manufacturer = row.manufacturer
+            if manufacturer and manufacturer not in seen_manufacturers:
+                seen_manufacturers.add(manufacturer)
+                pending_manufacturers.add(manufacturer)
+                if len(pending_manufacturers) >= 200:
+                    _upsert_manufacturers(client, pending_manufacturers)
+                    pending_manufacturers = set()
+            if media_queue_path is not None and row.media:
+                media_queue.append(
+                    {"productNumber": row.productNumber, "urls": row.media}
+                )
+            batch.append(payload)
+            if len(batch) >= batch_size:
+                if pending_manufacturers:
+                    _upsert_manufacturers(client, pending_manufacturers)
+                    pending_manufacturers = set()
+                _finalize_gross(batch)
+                in_flight.append(executor.submit(_send_batch, client, batch))
+                batch = []
+                while len(in_flight) >= concurrency:
+                    _drain_one()
+                if media_queue:
+                    append_ndjson(media_queue, media_queue_path)
+                    media_queue = []
+        if pending_manufacturers:
+            _upsert_manufacturers(client, pending_manufacturers)
+        if batch:
+            _finalize_gross(batch)
+            in_flight.append(executor.submit(_send_batch, client, batch))
+        while in_flight:
+            _drain_one()
+        if media_queue:
+            append_ndjson(media_queue, media_queue_path)
+    log.info("imported %d/%d products (%d skipped)", sent, total, skipped)
+    return {"total": total, "imported": sent, "skipped": skipped}
+
+
+def import_products(
+    ndjson_path: Path | str,
+    settings: Settings,
+    batch_size: int | None = None,
+    error_path: Path | str | None = None,
+    media_queue_path: Path | str | None = None,
+    concurrency: int | None = None,
+) -> dict[str, int]:
+    """Import all products from an NDJSON file."""
+    return import_products_stream(
+        iter_ndjson(ndjson_path, Product),
+        settings,
+        batch_size=batch_size,
+        error_path=error_path,
+        media_queue_path=media_queue_path,
+        concurrency=concurrency,
+    )
@@ -0,0 +1,34 @@
+"""Structured logging for the CLI."""
+
+from __future__ import annotations
+
+import logging
+
+import orjson
+
+
+class JsonLogFormatter(logging.Formatter):
+    """One JSON object per log line, suitable for shipping to a collector."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S%z"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            payload["exc_info"] = self.formatException(record.exc_info)
+        return orjson.dumps(payload).decode("utf-8")
+
+
+def configure_logging(verbose: bool = False, as_json: bool = False) -> None:
+    handler = logging.StreamHandler()
+    if as_json:
+        handler.setFormatter(JsonLogFormatter())
+    else:
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s"))
+    logging.basicConfig(
+        level=logging.DEBUG if verbose else logging.INFO,
+        handlers=[handler],
+    )
@@ -0,0 +1,32 @@
+"""Typed product rows exchanged between the parser and the importer."""
+
+from __future__ import annotations
+
+import msgspec
+
+
+class Price(msgspec.Struct):
+    """Raw price block as found in the catalog; values are still strings."""
+
+    net: str | None = None
+    currency: str | None = None
+    tax: str | None = None
+
+
+class Product(msgspec.Struct):
+    """One parsed catalog article.
+
+    A Struct keeps the millions of rows allocation-light (slots, no
+    per-instance dict) and lets the NDJSON layer encode and decode them
+    natively — decoding doubles as schema validation.
+    """
+
+    productNumber: str
+    name: str | None = None
+    description: str | None = None
+    ean: str | None = None
+    manufacturer: str | None = None
+    price: Price | None = None
+    tax_rate: str | None = None
+    customFields: dict[str, str] = {}
+    media: list[str] = []
@@ -0,0 +1,73 @@
+"""Newline-delimited JSON helpers used between pipeline stages.
+
+Serialization goes through ``msgspec``: it encodes both plain dicts and
+the :mod:`~shopware_bmecat.models` structs natively, emits UTF-8 bytes
+directly, and ``encode_into`` lets a whole chunk of lines accumulate in
+one reusable buffer. Files are opened in binary mode with a 1 MiB buffer
+so no text-layer re-encoding happens per line.
+"""
+
+from __future__ import annotations
+
+from itertools import islice
+from pathlib import Path
+from typing import Any, Iterable, Iterator
+
+import msgspec
+
+_BUFFER_SIZE = 1 << 20
+#: Lines per write() call; bounds peak memory while keeping the number of
+#: Python->C write transitions at one per chunk instead of two per row.
+_CHUNK_SIZE = 4096
+
+_encoder = msgspec.json.Encoder()
+
+
+def _write_items(handle: Any, items: Iterable[Any]) -> int:
+    count = 0
+    iterator = iter(items)
+    buffer = bytearray()
+    while chunk := list(islice(iterator, _CHUNK_SIZE)):
+        del buffer[:]
+        for item in chunk:
+            _encoder.encode_into(item, buffer, len(buffer))
+            buffer += b"\n"
+        handle.write(buffer)
+        count += len(chunk)
+    return count
+
+
+def write_ndjson(items: Iterable[Any], path: Path | str) -> int:
+    """Write *items* to *path*, one JSON object per line. Returns the count."""
+    with open(path, "wb", buffering=_BUFFER_SIZE) as handle:
+        return _write_items(handle, items)
+
+
+def append_ndjson(items: Iterable[Any], path: Path | str) -> int:
+    """Append *items* to *path*; used for error and media queues."""
+    with open(path, "ab", buffering=_BUFFER_SIZE) as handle:
+        return _write_items(handle, items)
+
+
+def tee_ndjson(items: Iterable[Any], path: Path | str) -> Iterator[Any]:
+    """Yield *items* unchanged while also writing them to *path*."""
+    with open(path, "wb", buffering=_BUFFER_SIZE) as handle:
+        for item in items:
+            handle.write(_encoder.encode(item) + b"\n")
+            yield item
+
+
+def iter_ndjson(path: Path | str, row_type: type = dict) -> Iterator[Any]:
+    """Yield one *row_type* per non-blank line of *path*.
+
+    Decoding into a struct type (e.g. ``Product``) validates the schema as
+    a side effect.
+    """
+    decode = msgspec.json.Decoder(row_type).decode
+    # Binary mode: the decoder takes bytes, so no text-layer UTF-8 decode.
+    with open(path, "rb", buffering=_BUFFER_SIZE) as handle:
+        for line in handle:
+            if line[-1:] == b"\n":
+                line = line[:-1]
+            if line and not line.isspace():
+                yield decode(line)
@@ -0,0 +1,82 @@
+"""YAML configuration with ``${ENV_VAR}`` expansion."""
+
+from __future__ import annotations
+
+import os
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+_ENV_PATTERN = re.compile(r"\$\{([A-Za-z_][A-Za-z0-9_]*)\}")
+
+
+def _sub_env(value: str) -> str:
+    return _ENV_PATTERN.sub(lambda m: os.environ.get(m.group(1), ""), value)
+
+
+def _expand_env(value: Any) -> Any:
+    """Substitute ``${VAR}`` references from the environment, in place.
+
+    Containers are mutated rather than copied and strings without a ``${``
+    are returned untouched, so a large config tree with few (or no)
+    references costs no allocations. The explicit stack also keeps deeply
+    nested documents away from the recursion limit.
+    """
+    if isinstance(value, str):
+        return _sub_env(value) if "${" in value else value
+    if not isinstance(value, (dict, list)):
+        return value
+    stack: list[dict[Any, Any] | list[Any]] = [value]
+    while stack:
+        container = stack.pop()
+        items = container.items() if isinstance(container, dict) else enumerate(container)
+        for key, item in items:
+            if isinstance(item, str):
+                if "${" in item:
+                    container[key] = _sub_env(item)
+            elif isinstance(item, (dict, list)):
+                stack.append(item)
+    return value
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Validated view over the YAML config file."""
+
+    shopware_url: str
+    client_id: str
+    client_secret: str
+    mapping: dict[str, str] = field(default_factory=dict)
+    currency_id: str = ""
+    tax_mapping: dict[str, str] = field(default_factory=dict)
+    default_tax_id: str | None = None
+    sales_channel_id: str | None = None
+    visibility: int = 30
+    batch_size: int = 100
+    concurrency: int = 4
+
+    @classmethod
+    def load(cls, path: Path | str) -> "Settings":
+        with open(path, "r", encoding="utf-8") as handle:
+            raw = _expand_env(yaml.safe_load(handle) or {})
+        shopware = raw.get("shopware", {})
+        tax = raw.get("tax", {})
+        for key in ("url", "client_id", "client_secret"):
+            if not shopware.get(key):
+                raise ValueError(f"config is missing shopware.{key}")
+        return cls(
+            shopware_url=shopware["url"],
+            client_id=shopware["client_id"],
+            client_secret=shopware["client_secret"],
+            mapping=raw.get("mapping", {}),
+            currency_id=shopware.get("currency_id", ""),
+            tax_mapping={str(rate): tax_id for rate, tax_id in (tax.get("mapping") or {}).items()},
+            default_tax_id=tax.get("default_id"),
+            sales_channel_id=shopware.get("sales_channel_id"),
+            visibility=int(shopware.get("visibility", 30)),
+            batch_size=int(raw.get("batch_size", 100)),
+            concurrency=int(raw.get("concurrency", 4)),
+        )